@@ -1,7 +1,6 @@
 from client import binance
 from client.influxdb import InfluxClient, InfluxConfig
 from dataloader import ohlc
-from dataloader.ohlc import Candle
 from executor.backtester import Backtester
 import setup
 
@@ -29,20 +28,11 @@ def main():
     backtester = Backtester(
         strategy=setup.strategy,
         influx_client=_build_influx_client(),
+        expected_bars=len(candles),
     )
     try:
-        for row in candles.itertuples(index=True):
-            backtester.ack(
-                Candle(
-                    timestamp=str(row.Index),
-                    open=float(row.open),
-                    high=float(row.high),
-                    low=float(row.low),
-                    close=float(row.close),
-                    volume=float(row.volume),
-                    timestamp_ns=int(row.Index.value),
-                )
-            )
+        for candle in ohlc.candles(candles):
+            backtester.ack(candle)
         backtester.summary()
         backtester.result("backtest.png")
     finally:
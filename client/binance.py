@@ -1,54 +1,93 @@
 """Download OHLCV and order book data from Binance via the public REST API."""
 
 import csv
+import gzip
 import os
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from logger import log
 
+try:
+    import orjson
+
+    def _json(resp: requests.Response):
+        return orjson.loads(resp.content)
+
+except ImportError:  # optional speed-up; stdlib json via requests otherwise
+
+    def _json(resp: requests.Response):
+        return resp.json()
+
 _KLINES_URL = "https://api.binance.com/api/v3/klines"
 _DEPTH_URL = "https://api.binance.com/api/v3/depth"
 
-# Map human-readable step strings to Binance interval codes.
-_INTERVAL_MAP = {
-    "1m": "1m",
-    "3m": "3m",
-    "5m": "5m",
-    "15m": "15m",
-    "30m": "30m",
-    "1h": "1h",
-    "2h": "2h",
-    "4h": "4h",
-    "6h": "6h",
-    "8h": "8h",
-    "12h": "12h",
-    "1d": "1d",
-    "3d": "3d",
-    "1w": "1w",
-    "1M": "1M",
+_KLINE_HEADER = ["timestamp", "open", "high", "low", "close", "volume"]
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Shared keep-alive session for all Binance requests.  Throttling (429,
+# 418 ban) and transient 5xx responses are retried with exponential
+# backoff, honouring Retry-After.
+_RETRY = Retry(
+    total=5,
+    backoff_factor=1.0,
+    status_forcelist=(418, 429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY),
+)
+
+# Concurrent kline page requests.
+_MAX_WORKERS = 8
+
+# Back off once the per-minute request weight reported by Binance passes
+# this (the hard limit is well above it).
+_WEIGHT_SOFT_LIMIT = 1000
+
+# Write buffer for large CSV outputs.
+_WRITE_BUFFER = 1 << 20
+
+# zlib level for compressed outputs (6 is the zlib default).
+_GZIP_LEVEL = 6
+
+# Step string -> (Binance interval code, seconds per step).
+_STEP_INFO = {
+    "1m": ("1m", 60),
+    "3m": ("3m", 180),
+    "5m": ("5m", 300),
+    "15m": ("15m", 900),
+    "30m": ("30m", 1800),
+    "1h": ("1h", 3600),
+    "2h": ("2h", 7200),
+    "4h": ("4h", 14400),
+    "6h": ("6h", 21600),
+    "8h": ("8h", 28800),
+    "12h": ("12h", 43200),
+    "1d": ("1d", 86400),
+    "3d": ("3d", 259200),
+    "1w": ("1w", 604800),
+    "1M": ("1M", 2592000),
 }
 
-# Seconds per step for computing how many snapshots to take.
-_STEP_SECONDS = {
-    "1m": 60,
-    "3m": 180,
-    "5m": 300,
-    "15m": 900,
-    "30m": 1800,
-    "1h": 3600,
-    "2h": 7200,
-    "4h": 14400,
-    "6h": 21600,
-    "8h": 28800,
-    "12h": 43200,
-    "1d": 86400,
-    "3d": 259200,
-    "1w": 604800,
-    "1M": 2592000,
-}
+
+def _validate_step(step: str) -> tuple[str, int]:
+    """Return ``(interval, seconds)`` for *step* or raise ``ValueError``."""
+    try:
+        return _STEP_INFO[step]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported step '{step}'. Choose from: {', '.join(_STEP_INFO)}"
+        ) from None
 
 
 def _instrument_to_symbol(instrument: str) -> str:
@@ -69,6 +108,166 @@ def _iso_to_seconds(iso: str) -> float:
     return dt.timestamp()
 
 
+def _respect_weight(resp: requests.Response) -> None:
+    """Sleep until the next minute if Binance reports heavy recent usage."""
+    used = int(resp.headers.get("x-mbx-used-weight-1m", 0))
+    if used > _WEIGHT_SOFT_LIMIT:
+        wait = 60 - time.time() % 60
+        log.warn("Binance weight %d used this minute, waiting %.0fs", used, wait)
+        time.sleep(wait)
+
+
+def _fetch_klines(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    limit: int,
+) -> list[list]:
+    """Fetch klines whose open time lies in ``[start_ms, end_ms)``."""
+    params = {
+        "symbol": symbol,
+        "interval": interval,
+        "startTime": start_ms,
+        "endTime": end_ms - 1,  # endTime is inclusive on Binance
+        "limit": limit,
+    }
+    resp = _SESSION.get(_KLINES_URL, params=params, timeout=30)
+    resp.raise_for_status()
+    _respect_weight(resp)
+    return _json(resp)
+
+
+def _format_ms(open_times: list[int] | np.ndarray) -> list[str]:
+    """Format epoch-millisecond times as ``YYYY-MM-DD HH:MM:SS`` (UTC) in one pass."""
+    seconds = np.array(open_times, dtype="datetime64[ms]").astype("datetime64[s]")
+    return np.char.replace(np.datetime_as_string(seconds), "T", " ").tolist()
+
+
+def _kline_rows(data: list[list]) -> list[tuple]:
+    """Format raw Binance klines as CSV rows."""
+    if not data:
+        return []
+    # Binance kline fields:
+    # 0=open_time, 1=open, 2=high, 3=low, 4=close, 5=volume, …
+    timestamps = _format_ms([c[0] for c in data])
+    return [
+        (ts, c[1], c[2], c[3], c[4], c[5])
+        for ts, c in zip(timestamps, data)
+    ]
+
+
+def _download_rows(
+    pool: ThreadPoolExecutor,
+    symbol: str,
+    step: str,
+    start_ms: int,
+    end_ms: int,
+) -> Iterator[list[tuple]]:
+    """Yield CSV rows for ``[start_ms, end_ms)`` one page at a time, in order."""
+    interval, step_s = _STEP_INFO[step]
+    limit = 1000  # Binance max per request
+
+    # Split the range into fixed windows of at most `limit` candles so
+    # pages can be requested independently and in parallel.
+    page_ms = step_s * 1000 * limit
+    page_starts = range(start_ms, end_ms, page_ms)
+
+    def fetch(page_start: int) -> list[list]:
+        page_end = min(page_start + page_ms, end_ms)
+        return _fetch_klines(symbol, interval, page_start, page_end, limit)
+
+    # Submit one batch of pages at a time so at most _MAX_WORKERS pages
+    # are held in memory; map() yields them in order.
+    for i in range(0, len(page_starts), _MAX_WORKERS):
+        for data in pool.map(fetch, page_starts[i:i + _MAX_WORKERS]):
+            yield _kline_rows(data)
+
+
+def _open_output(path: str, compress: bool):
+    """Open *path* for CSV writing, gzip-compressed when *compress*."""
+    if compress:
+        return gzip.open(path, "wt", newline="", compresslevel=_GZIP_LEVEL)
+    return open(path, "w", newline="", buffering=_WRITE_BUFFER)
+
+
+def _month_chunks(start_ms: int, end_ms: int) -> list[tuple[datetime, int, int]]:
+    """UTC calendar months overlapping ``[start_ms, end_ms)``.
+
+    Each entry is ``(month, month_start_ms, month_end_ms)``.
+    """
+    start = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
+    month = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    chunks = []
+    while int(month.timestamp() * 1000) < end_ms:
+        following = month.replace(
+            year=month.year + month.month // 12,
+            month=month.month % 12 + 1,
+        )
+        chunks.append((
+            month,
+            int(month.timestamp() * 1000),
+            int(following.timestamp() * 1000),
+        ))
+        month = following
+    return chunks
+
+
+def _month_rows(
+    pool: ThreadPoolExecutor,
+    symbol: str,
+    step: str,
+    chunk_dir: str,
+    month: datetime,
+    month_start_ms: int,
+    month_end_ms: int,
+    start_ms: int,
+    end_ms: int,
+) -> Iterator[list[tuple]]:
+    """Yield CSV rows for one calendar month, from disk when cached.
+
+    A completed month that ``[start_ms, end_ms)`` covers entirely is
+    downloaded whole and saved under *chunk_dir*, so any later range that
+    overlaps it is served without a request.  A month only counts as
+    completed once its last candle has closed, which for steps longer
+    than a day is after the month ends.  For a month the range only
+    partly covers (or one not yet completed), just the overlap is fetched
+    and nothing is cached, so short ranges never pay for a full month and
+    an open candle is never cached.  Rows from a cached month are not
+    trimmed to the range.
+    """
+    path = os.path.join(chunk_dir, month.strftime("%Y-%m") + ".csv")
+    if os.path.exists(path):
+        log.debug("Using cached klines: %s", path)
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            yield list(reader)
+        return
+
+    now_ms = int(time.time() * 1000)
+    # The last candle opening in the month closes up to one step after it.
+    closed_ms = month_end_ms + _STEP_INFO[step][1] * 1000
+    if start_ms > month_start_ms or end_ms < month_end_ms or closed_ms > now_ms:
+        yield from _download_rows(
+            pool,
+            symbol,
+            step,
+            max(start_ms, month_start_ms),
+            min(end_ms, month_end_ms, now_ms),
+        )
+        return
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(_KLINE_HEADER)
+        for rows in _download_rows(pool, symbol, step, month_start_ms, month_end_ms):
+            writer.writerows(rows)
+            yield rows
+    os.replace(tmp_path, path)
+
+
 # ---------------------------------------------------------------------------
 # OHLCV (price) download
 # ---------------------------------------------------------------------------
@@ -80,9 +279,15 @@ def price(
     step: str = "1h",
     format: str = "csv",
     output_dir: str = "data",
+    compress: bool = True,
 ) -> str:
     """Download OHLCV candles from Binance and save to a file.
 
+    Every UTC calendar month the range fully covers is cached under
+    ``output_dir/{symbol}_{step}/``, so overlapping ranges only download
+    the months not fetched before.  Partly covered months at either end
+    are fetched for just the requested span.
+
     Parameters
     ----------
     instrument : str
@@ -97,93 +302,61 @@ def price(
         Output format. Currently only ``"csv"`` is supported.
     output_dir : str
         Directory to write the output file into.
+    compress : bool
+        Gzip the output (``.csv.gz``).  ``pd.read_csv`` and the loaders in
+        :mod:`dataloader` read it transparently.
 
     Returns
     -------
     str
         Path to the saved file.
     """
-    if step not in _INTERVAL_MAP:
-        raise ValueError(
-            f"Unsupported step '{step}'. Choose from: {', '.join(_INTERVAL_MAP)}"
-        )
+    _validate_step(step)
     if format != "csv":
         raise ValueError(f"Unsupported format '{format}'. Only 'csv' is supported.")
 
     symbol = _instrument_to_symbol(instrument)
     filename = f"{symbol}_{step}_{start[:10]}_{end[:10]}.csv"
+    if compress:
+        filename += ".gz"
     filepath = os.path.join(output_dir, filename)
 
     if os.path.exists(filepath):
         log.info(f"File already exists, skipping download: {filepath}")
         return filepath
 
-    interval = _INTERVAL_MAP[step]
     start_ms = _iso_to_ms(start)
     end_ms = _iso_to_ms(end)
-
-    all_candles: list[list] = []
-    current_start = start_ms
-    limit = 1000  # Binance max per request
+    # Row timestamps sort lexically, so range filtering is a string compare.
+    lo = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc).strftime(_TS_FORMAT)
+    hi = datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc).strftime(_TS_FORMAT)
+    count = 0
 
     log.info(f"Downloading {instrument} ({step}) from {start} to {end} …")
 
-    while current_start < end_ms:
-        params = {
-            "symbol": symbol,
-            "interval": interval,
-            "startTime": current_start,
-            "endTime": end_ms - 1,  # endTime is inclusive on Binance
-            "limit": limit,
-        }
-        resp = requests.get(_KLINES_URL, params=params, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-
-        if not data:
-            break
-
-        all_candles.extend(data)
-        # Move start to 1 ms after the last candle's open time to avoid overlap
-        current_start = data[-1][0] + 1
-
-        if len(data) < limit:
-            break
-
-        # Be polite to the API
-        time.sleep(0.2)
+    # Write to a temp file so an interrupted download never leaves a
+    # partial CSV behind that the "already exists" check above would accept.
+    chunk_dir = os.path.join(output_dir, f"{symbol}_{step}")
+    os.makedirs(chunk_dir, exist_ok=True)
+    tmp_path = filepath + ".tmp"
 
-    log.info(f"Fetched {len(all_candles)} candles.")
-
-    # ---- Write to CSV ----
-    os.makedirs(output_dir, exist_ok=True)
-
-    header = [
-        "timestamp",
-        "open",
-        "high",
-        "low",
-        "close",
-        "volume",
-    ]
-
-    with open(filepath, "w", newline="") as f:
+    with _open_output(tmp_path, compress) as f, ThreadPoolExecutor(_MAX_WORKERS) as pool:
         writer = csv.writer(f)
-        writer.writerow(header)
-        for candle in all_candles:
-            # Binance kline fields:
-            # 0=open_time, 1=open, 2=high, 3=low, 4=close, 5=volume, …
-            open_time_s = candle[0] / 1000.0
-            dt = datetime.fromtimestamp(open_time_s, tz=timezone.utc)
-            writer.writerow([
-                dt.strftime("%Y-%m-%d %H:%M:%S"),
-                candle[1],  # open
-                candle[2],  # high
-                candle[3],  # low
-                candle[4],  # close
-                candle[5],  # volume
-            ])
-
+        writer.writerow(_KLINE_HEADER)
+
+        for month, month_start_ms, month_end_ms in _month_chunks(start_ms, end_ms):
+            inside = start_ms <= month_start_ms and month_end_ms <= end_ms
+            for rows in _month_rows(
+                pool, symbol, step, chunk_dir,
+                month, month_start_ms, month_end_ms, start_ms, end_ms,
+            ):
+                if not inside:
+                    rows = [r for r in rows if lo <= r[0] < hi]
+                writer.writerows(rows)
+                count += len(rows)
+
+    os.replace(tmp_path, filepath)
+    log.info(f"Fetched {count} candles.")
     log.info(f"Saved to {filepath}")
     return filepath
 
@@ -200,6 +373,7 @@ def order_book(
     depth: int | str = 100,
     format: str = "csv",
     output_dir: str = "data",
+    compress: bool = True,
 ) -> str:
     """Fetch order book snapshots from Binance at regular intervals.
 
@@ -225,6 +399,8 @@ def order_book(
         Output format. Currently only ``"csv"`` is supported.
     output_dir : str
         Directory to write the output file into.
+    compress : bool
+        Gzip the output (``.csv.gz``).
 
     Returns
     -------
@@ -234,13 +410,12 @@ def order_book(
     depth = int(depth)
     if format != "csv":
         raise ValueError(f"Unsupported format '{format}'. Only 'csv' is supported.")
-    if step not in _STEP_SECONDS:
-        raise ValueError(
-            f"Unsupported step '{step}'. Choose from: {', '.join(_STEP_SECONDS)}"
-        )
+    _, step_s = _validate_step(step)
 
     symbol = _instrument_to_symbol(instrument)
     filename = f"{symbol}_book_d{depth}_{step}_{start[:10]}_{end[:10]}.csv"
+    if compress:
+        filename += ".gz"
     filepath = os.path.join(output_dir, filename)
 
     if os.path.exists(filepath):
@@ -249,7 +424,6 @@ def order_book(
 
     start_s = _iso_to_seconds(start)
     end_s = _iso_to_seconds(end)
-    step_s = _STEP_SECONDS[step]
 
     os.makedirs(output_dir, exist_ok=True)
 
@@ -258,30 +432,23 @@ def order_book(
 
     log.info(f"Downloading {instrument} order book (depth={depth}, step={step}) …")
 
-    with open(filepath, "w", newline="") as f:
+    with _open_output(filepath, compress) as f:
         writer = csv.writer(f)
         writer.writerow(header)
 
-        ts = start_s
-        while ts < end_s:
-            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-            ts_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-
-            params = {"symbol": symbol, "limit": depth}
-            resp = requests.get(_DEPTH_URL, params=params, timeout=30)
+        # Snapshot labels are loop-invariant; format them all up front.
+        snapshot_ms = (np.arange(start_s, end_s, step_s) * 1000).astype(np.int64)
+        params = {"symbol": symbol, "limit": depth}
+        for ts_str in _format_ms(snapshot_ms):
+            resp = _SESSION.get(_DEPTH_URL, params=params, timeout=30)
             resp.raise_for_status()
-            data = resp.json()
-
-            for bid in data.get("bids", []):
-                writer.writerow([ts_str, "bid", bid[0], bid[1]])
-                rows_written += 1
-
-            for ask in data.get("asks", []):
-                writer.writerow([ts_str, "ask", ask[0], ask[1]])
-                rows_written += 1
+            _respect_weight(resp)
+            data = _json(resp)
 
-            ts += step_s
-            time.sleep(0.2)
+            rows = [(ts_str, "bid", b[0], b[1]) for b in data.get("bids", [])]
+            rows += [(ts_str, "ask", a[0], a[1]) for a in data.get("asks", [])]
+            writer.writerows(rows)
+            rows_written += len(rows)
 
     log.info(f"Fetched {rows_written} rows.")
     log.info(f"Saved to {filepath}")
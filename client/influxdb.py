@@ -76,13 +76,13 @@ class InfluxClient:
         self._queue.put(value.to_line())
         qsize = self._queue.qsize()
         if qsize == 1 or qsize % self._batch_size == 0:
-            log.debug(f"Influx enqueue ok: queue_size={qsize}")
+            log.debug("Influx enqueue ok: queue_size=%d", qsize)
 
     def flush(self) -> None:
         if self._closed.is_set():
             return
 
-        log.debug(f"Influx flush requested: queue_size={self._queue.qsize()}")
+        log.debug("Influx flush requested: queue_size=%d", self._queue.qsize())
         self._flush_now.set()
         self._queue.put(self._WAKE)
         self._queue.join()
@@ -116,8 +116,9 @@ class InfluxClient:
                 return False
             else:
                 log.debug(
-                    f"Influx write ok: status={response.status_code} "
-                    f"batch_points={len(lines)}"
+                    "Influx write ok: status=%d batch_points=%d",
+                    response.status_code,
+                    len(lines),
                 )
                 return True
         except requests.RequestException as exc:
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import csv
 import hashlib
 import hmac
@@ -13,29 +12,83 @@ import queue
 import re
 import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
 import websockets
 
 from logger import log
 from monitor.measurement import ClientRequestMeasurement
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+
+except ImportError:  # optional speed-up; stdlib json otherwise
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:  # SIMD encoder is optional; stdlib base64 otherwise
+    from base64 import b64encode as _b64encode
+
 if TYPE_CHECKING:
     from client.influxdb import InfluxClient
 
 _BASE_URL = "https://www.okx.com"
 _WS_BUSINESS_URL = "wss://ws.okx.com/ws/v5/business"
 _WS_DEMO_BUSINESS_URL = "wss://wspap.okx.com:8443/ws/v5/business?brokerId=9999"
+_KEEP_ALIVE_PATH = "/api/v5/public/time"
+
+# Max candles per /market/candles request.
+_CANDLE_PAGE_LIMIT = 300
+
+# Concurrent candle page requests (the endpoint allows 40 per 2s).
+_MAX_PAGE_WORKERS = 4
+
+# Fixed bar lengths in ms; bars not listed (e.g. "1M") are paged
+# sequentially with the ``after`` cursor.
+_BAR_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1H": 3_600_000,
+    "2H": 7_200_000,
+    "4H": 14_400_000,
+    "6H": 21_600_000,
+    "12H": 43_200_000,
+    "1D": 86_400_000,
+    "2D": 172_800_000,
+    "3D": 259_200_000,
+    "1W": 604_800_000,
+    "6Hutc": 21_600_000,
+    "12Hutc": 43_200_000,
+    "1Dutc": 86_400_000,
+    "2Dutc": 172_800_000,
+    "3Dutc": 259_200_000,
+    "1Wutc": 604_800_000,
+}
 
 
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Represents a placed or queried order."""
 
@@ -56,7 +109,7 @@ class Order:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents an open position."""
 
@@ -75,7 +128,7 @@ class Position:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Candle:
     """Represents a single OHLCV candle from the WebSocket feed."""
 
@@ -140,10 +193,27 @@ class Client:
     ):
         self._api_key = api_key
         self._secret_key = secret_key
+        # Keyed HMAC with the ipad/opad blocks already absorbed; _sign()
+        # copies it instead of re-deriving the key schedule per request.
+        self._hmac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
         self._passphrase = passphrase
         self._demo = demo
         self._base_url = _BASE_URL
+        # Header fields that are the same on every request; _headers()
+        # copies this and fills in the signature and timestamp.
+        self._base_headers = {
+            "OK-ACCESS-KEY": api_key,
+            "OK-ACCESS-PASSPHRASE": passphrase,
+            "Content-Type": "application/json",
+        }
+        if demo:
+            self._base_headers["x-simulated-trading"] = "1"
         self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0),
+        )
+        self._keep_alive_stop: threading.Event | None = None
         self._influx_client = influx_client
         self._request_measurement: ClientRequestMeasurement | None = None
         if self._influx_client is not None:
@@ -179,40 +249,68 @@ class Client:
         )
         self._influx_client.write(value)
 
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+
+    def start_keep_alive(self, interval: float = 30.0) -> None:
+        """Ping OKX periodically so the pooled connection stays open.
+
+        Orders are sparse in live trading, so without traffic the idle
+        TLS connection is dropped and the next order pays a fresh
+        handshake.  The ping hits a public endpoint on a daemon thread.
+        """
+        if self._keep_alive_stop is not None:
+            return
+        stop = threading.Event()
+        self._keep_alive_stop = stop
+
+        def _ping() -> None:
+            while not stop.wait(interval):
+                try:
+                    self._session.get(self._base_url + _KEEP_ALIVE_PATH, timeout=10)
+                except requests.RequestException as exc:
+                    log.debug("OKX keep-alive ping failed: %s", exc)
+
+        threading.Thread(target=_ping, daemon=True, name="okx-keep-alive").start()
+
+    def close(self) -> None:
+        """Stop the keep-alive ping and release pooled connections."""
+        if self._keep_alive_stop is not None:
+            self._keep_alive_stop.set()
+            self._keep_alive_stop = None
+        self._session.close()
+
     # ------------------------------------------------------------------
     # Authentication helpers
     # ------------------------------------------------------------------
 
     def _timestamp(self) -> str:
         """Return the current UTC timestamp in ISO-8601 format for OKX."""
-        now = datetime.now(timezone.utc)
-        return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
+        now = time.time()
+        t = time.gmtime(now)
+        return "%04d-%02d-%02dT%02d:%02d:%02d.%03dZ" % (
+            t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec,
+            int(now % 1 * 1000),
+        )
 
-    def _sign(self, timestamp: str, method: str, path: str, body: str = "") -> str:
+    def _sign(self, timestamp: str, method: str, path: str, body: bytes = b"") -> str:
         """Create the HMAC-SHA256 signature required by OKX.
 
         Signature = Base64(HMAC-SHA256(timestamp + METHOD + requestPath + body, secretKey))
+
+        *body* is the exact serialised bytes sent on the wire.
         """
-        prehash = timestamp + method.upper() + path + body
-        mac = hmac.new(
-            self._secret_key.encode("utf-8"),
-            prehash.encode("utf-8"),
-            hashlib.sha256,
-        )
-        return base64.b64encode(mac.digest()).decode("utf-8")
+        mac = self._hmac.copy()
+        mac.update((timestamp + method.upper() + path).encode("utf-8") + body)
+        return _b64encode(mac.digest()).decode("utf-8")
 
-    def _headers(self, method: str, path: str, body: str = "") -> dict:
+    def _headers(self, method: str, path: str, body: bytes = b"") -> dict:
         """Build authenticated request headers."""
         ts = self._timestamp()
-        headers = {
-            "OK-ACCESS-KEY": self._api_key,
-            "OK-ACCESS-SIGN": self._sign(ts, method, path, body),
-            "OK-ACCESS-TIMESTAMP": ts,
-            "OK-ACCESS-PASSPHRASE": self._passphrase,
-            "Content-Type": "application/json",
-        }
-        if self._demo:
-            headers["x-simulated-trading"] = "1"
+        headers = self._base_headers.copy()
+        headers["OK-ACCESS-SIGN"] = self._sign(ts, method, path, body)
+        headers["OK-ACCESS-TIMESTAMP"] = ts
         return headers
 
     # ------------------------------------------------------------------
@@ -229,9 +327,9 @@ class Client:
         """Authenticated GET request."""
         status_code = 0
         if params:
-            query = "&".join(
-                f"{k}={v}" for k, v in params.items() if v is not None
-            )
+            # The signature covers the query exactly as sent, so build it here
+            # rather than letting requests encode params.
+            query = urlencode([(k, v) for k, v in params.items() if v is not None])
             full_path = f"{path}?{query}" if query else path
         else:
             full_path = path
@@ -243,7 +341,7 @@ class Client:
             )
             status_code = resp.status_code
             resp.raise_for_status()
-            data = resp.json()
+            data = _loads(resp.content)
             okx_code = str(data.get("code", ""))
             if okx_code != "0":
                 raise OKXError(okx_code or "?", str(data.get("msg", "unknown error")))
@@ -265,15 +363,15 @@ class Client:
     ) -> dict:
         """Authenticated POST request."""
         status_code = 0
-        body_str = json.dumps(body) if body else ""
+        body_bytes = _dumps(body) if body else b""
         try:
-            headers = self._headers("POST", path, body_str)
+            headers = self._headers("POST", path, body_bytes)
             resp = self._session.post(
-                self._base_url + path, headers=headers, data=body_str, timeout=10,
+                self._base_url + path, headers=headers, data=body_bytes, timeout=10,
             )
             status_code = resp.status_code
             resp.raise_for_status()
-            data = resp.json()
+            data = _loads(resp.content)
             okx_code = str(data.get("code", ""))
             if okx_code != "0":
                 # Include detailed sub-error from data array if available
@@ -406,6 +504,35 @@ class Client:
     # Market data
     # ------------------------------------------------------------------
 
+    def instrument(
+        self,
+        instrument: str,
+        instrument_type: str = "SWAP",
+        *,
+        session_id: str | None = None,
+    ) -> dict:
+        """Get the contract specification for an instrument.
+
+        Parameters
+        ----------
+        instrument : str
+            Instrument ID, e.g. ``"ETH-USDT-SWAP"``.
+        instrument_type : str
+            ``"SPOT"``, ``"MARGIN"``, ``"SWAP"``, ``"FUTURES"``, ``"OPTION"``.
+
+        Returns
+        -------
+        dict
+            Instrument details including ``ctVal`` (contract value),
+            ``lotSz`` and ``tickSz``.
+        """
+        params = {"instType": instrument_type, "instId": instrument}
+        if instrument_type == "OPTION":
+            # Option lookups must name the family, e.g. "BTC-USD".
+            params["instFamily"] = "-".join(instrument.split("-")[:2])
+        data = self._get("/api/v5/public/instruments", params, session_id=session_id)
+        return data["data"][0] if data["data"] else {}
+
     def ticker(self, instrument: str, *, session_id: str | None = None) -> dict:
         """Get the latest ticker for an instrument.
 
@@ -526,31 +653,9 @@ class Client:
         start_ts = int((now - delta).timestamp() * 1000)
         end_ts = int(now.timestamp() * 1000)
 
-        # OKX returns newest-first and max 300 per request; paginate backwards
-        all_candles: list[list] = []
-        cursor = str(end_ts)
-
         log.info(f"Downloading {instrument} ({bar}) last {duration_from_now} …")
 
-        while True:
-            raw = self.candles(
-                instrument=instrument,
-                bar=bar,
-                limit=300,
-                before=str(start_ts - 1),
-                after=cursor,
-                session_id=session_id,
-            )
-            if not raw:
-                break
-
-            all_candles.extend(raw)
-            oldest_ts = int(raw[-1][0])
-
-            if oldest_ts <= start_ts or len(raw) < 300:
-                break
-
-            cursor = str(oldest_ts)
+        all_candles = self._candle_range(instrument, bar, start_ts, end_ts, session_id)
 
         # Sort chronologically (oldest first)
         all_candles.sort(key=lambda c: int(c[0]))
@@ -586,6 +691,77 @@ class Client:
         log.info(f"Saved to {filepath}")
         return filepath
 
+    def _candle_range(
+        self,
+        instrument: str,
+        bar: str,
+        start_ts: int,
+        end_ts: int,
+        session_id: str | None,
+    ) -> list[list]:
+        """Fetch raw candles with open time in ``[start_ts, end_ts]``, unordered.
+
+        When the bar length is fixed the range is split into windows of at
+        most one page each and fetched concurrently on the pooled session;
+        otherwise it pages backwards from *end_ts* with the ``after`` cursor.
+        """
+        bar_ms = _BAR_MS.get(bar)
+        if bar_ms is None:
+            return self._candle_range_sequential(
+                instrument, bar, start_ts, end_ts, session_id,
+            )
+
+        page_ms = bar_ms * _CANDLE_PAGE_LIMIT
+
+        def fetch(page_start: int) -> list[list]:
+            return self.candles(
+                instrument=instrument,
+                bar=bar,
+                limit=_CANDLE_PAGE_LIMIT,
+                before=str(page_start - 1),
+                after=str(min(page_start + page_ms, end_ts + 1)),
+                session_id=session_id,
+            )
+
+        with ThreadPoolExecutor(_MAX_PAGE_WORKERS) as pool:
+            pages = pool.map(fetch, range(start_ts, end_ts + 1, page_ms))
+            return [c for page in pages for c in page]
+
+    def _candle_range_sequential(
+        self,
+        instrument: str,
+        bar: str,
+        start_ts: int,
+        end_ts: int,
+        session_id: str | None,
+    ) -> list[list]:
+        """Page backwards from *end_ts* one request at a time."""
+        # OKX returns newest-first and max 300 per request; paginate backwards
+        all_candles: list[list] = []
+        cursor = str(end_ts)
+
+        while True:
+            raw = self.candles(
+                instrument=instrument,
+                bar=bar,
+                limit=_CANDLE_PAGE_LIMIT,
+                before=str(start_ts - 1),
+                after=cursor,
+                session_id=session_id,
+            )
+            if not raw:
+                break
+
+            all_candles.extend(raw)
+            oldest_ts = int(raw[-1][0])
+
+            if oldest_ts <= start_ts or len(raw) < _CANDLE_PAGE_LIMIT:
+                break
+
+            cursor = str(oldest_ts)
+
+        return all_candles
+
     # ------------------------------------------------------------------
     # Trading
     # ------------------------------------------------------------------
@@ -879,25 +1055,62 @@ class Client:
 
 _SENTINEL = object()
 
+# Frames (candle batches) buffered between the WebSocket thread and the
+# consumer before new updates are dropped.
+_MAX_PENDING_CANDLES = 8192
+
+# Dropped-update count between "queue full" warnings.
+_DROP_WARN_INTERVAL = 1000
+
 
 class CandleChannel:
     """Iterable stream of real-time :class:`Candle` updates.
 
     Internally runs the async WebSocket connection on a daemon thread
-    and feeds candles through a :class:`queue.Queue` so the caller can
+    and feeds candles through a :class:`queue.SimpleQueue` so the caller can
     consume them with a plain ``for`` loop.
 
     The channel reconnects automatically if the connection drops.
     Call :meth:`close` or break out of the loop to stop.
+
+    Each WebSocket frame is parsed in one go and queued as a single
+    batch, so a reconnect replay of hundreds of rows costs one queue
+    operation; the iterator still yields one candle at a time.
+
+    The queue is bounded so a slow consumer cannot stall the socket
+    reader: once *max_pending* batches are waiting, newer intra-bar
+    updates are dropped and counted in :attr:`dropped`.  Bar-close
+    candles (``confirm=True``) are always delivered, since skipping one
+    would leave the strategy a bar behind the market.
     """
 
-    def __init__(self, ws_url: str, instrument: str, bar: str) -> None:
+    def __init__(
+        self,
+        ws_url: str,
+        instrument: str,
+        bar: str,
+        max_pending: int = _MAX_PENDING_CANDLES,
+    ) -> None:
         self._ws_url = ws_url
         self._instrument = instrument
         self._bar = bar
         self._channel = f"candle{bar}"
-        self._queue: queue.Queue[Candle | object] = queue.Queue()
+        # Sent as str: OKX expects text frames.
+        self._subscribe_msg = _dumps({
+            "op": "subscribe",
+            "args": [{"channel": self._channel, "instId": instrument}],
+        }).decode("utf-8")
+        # Single producer / single consumer: SimpleQueue's one C-level lock
+        # is enough; the bound is enforced in _offer().
+        self._queue: queue.SimpleQueue[Candle | object] = queue.SimpleQueue()
+        self._max_pending = max_pending
+        self._pending: Iterator[Candle] = iter(())
+        # Updates for the open bar repeat its open time, so the last
+        # formatted timestamp is almost always reusable.
+        self._ts_cache: tuple[int, str] = (-1, "")
         self._stopped = threading.Event()
+        self.dropped = 0
+        self._drop_warn_at = 1
 
         self._thread = threading.Thread(
             target=self._run, daemon=True, name=f"ws-{instrument}-{bar}",
@@ -911,6 +1124,9 @@ class CandleChannel:
 
     def __next__(self) -> Candle:
         while True:
+            candle = next(self._pending, None)
+            if candle is not None:
+                return candle
             try:
                 item = self._queue.get(timeout=1)
             except queue.Empty:
@@ -919,15 +1135,50 @@ class CandleChannel:
                 continue
             if item is _SENTINEL:
                 raise StopIteration
-            return item
+            self._pending = iter(item)
 
     # -- lifecycle ---------------------------------------------------------
 
     def close(self) -> None:
         """Signal the background thread to stop."""
         self._stopped.set()
+        self._put_sentinel()
+
+    def _put_sentinel(self) -> None:
         self._queue.put(_SENTINEL)
 
+    def _offer(self, candles: list[Candle]) -> None:
+        """Enqueue a batch without blocking the socket reader.
+
+        When the queue is full only unconfirmed (intra-bar) updates are
+        shed; confirmed candles in the batch are still enqueued.
+        """
+        if self._queue.qsize() < self._max_pending:
+            self._queue.put(candles)
+            return
+
+        confirmed = [c for c in candles if c.confirm]
+        if confirmed:
+            self._queue.put(confirmed)
+        dropped = len(candles) - len(confirmed)
+        if not dropped:
+            return
+        self.dropped += dropped
+        if self.dropped >= self._drop_warn_at:
+            log.warn("Candle queue full, dropped %d updates", self.dropped)
+            self._drop_warn_at = (
+                self.dropped // _DROP_WARN_INTERVAL + 1
+            ) * _DROP_WARN_INTERVAL
+
+    def _format_ts(self, open_ms: str) -> str:
+        """Format an epoch-ms open time as ``YYYY-MM-DD HH:MM:SS`` (UTC)."""
+        sec = int(open_ms) // 1000
+        cached_sec, formatted = self._ts_cache
+        if sec != cached_sec:
+            formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(sec))
+            self._ts_cache = (sec, formatted)
+        return formatted
+
     # -- background thread -------------------------------------------------
 
     def _run(self) -> None:
@@ -936,20 +1187,22 @@ class CandleChannel:
 
     async def _ws_loop(self) -> None:
         """Maintain the WebSocket connection and push candles to the queue."""
-        subscribe_msg = json.dumps({
-            "op": "subscribe",
-            "args": [{"channel": self._channel, "instId": self._instrument}],
-        })
-
         while not self._stopped.is_set():
             try:
-                log.info(f"Connecting to OKX WebSocket ({self._channel} {self._instrument}) …")
+                log.info(
+                    "Connecting to OKX WebSocket (%s %s) …",
+                    self._channel,
+                    self._instrument,
+                )
+                # Candle frames are small; permessage-deflate would cost more
+                # CPU to inflate than it saves on the wire.
                 async with websockets.connect(
                     self._ws_url, ping_interval=20, open_timeout=10,
+                    compression=None,
                 ) as ws:
-                    await ws.send(subscribe_msg)
+                    await ws.send(self._subscribe_msg)
 
-                    resp = json.loads(
+                    resp = _loads(
                         await asyncio.wait_for(ws.recv(), timeout=10),
                     )
                     if resp.get("event") == "error":
@@ -957,21 +1210,19 @@ class CandleChannel:
                             resp.get("code", "?"),
                             resp.get("msg", "subscribe failed"),
                         )
-                    log.info(f"Subscribed to {self._channel} {self._instrument}")
+                    log.info("Subscribed to %s %s", self._channel, self._instrument)
 
                     async for raw in ws:
                         if self._stopped.is_set():
                             return
 
-                        msg = json.loads(raw)
+                        msg = _loads(raw)
                         if "data" not in msg:
                             continue
 
-                        for entry in msg["data"]:
-                            candle = Candle(
-                                timestamp=datetime.fromtimestamp(
-                                    int(entry[0]) / 1000, tz=timezone.utc,
-                                ).strftime("%Y-%m-%d %H:%M:%S"),
+                        self._offer([
+                            Candle(
+                                timestamp=self._format_ts(entry[0]),
                                 open=entry[1],
                                 high=entry[2],
                                 low=entry[3],
@@ -981,11 +1232,12 @@ class CandleChannel:
                                 volume_quote=entry[7],
                                 confirm=entry[8] == "1",
                             )
-                            self._queue.put(candle)
+                            for entry in msg["data"]
+                        ])
 
             except (websockets.ConnectionClosed, TimeoutError):
                 if not self._stopped.is_set():
                     log.warn("WebSocket disconnected, reconnecting in 3s …")
                     await asyncio.sleep(3)
 
-        self._queue.put(_SENTINEL)
+        self._put_sentinel()
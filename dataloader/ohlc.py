@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 
@@ -90,7 +92,7 @@ def csv(path: str) -> pd.DataFrame:
     Parameters
     ----------
     path : str
-        Path to the CSV file.
+        Path to the CSV file (``.csv.gz`` is decompressed transparently).
 
     Returns
     -------
@@ -108,3 +110,30 @@ def csv(path: str) -> pd.DataFrame:
         df[col] = pd.to_numeric(df[col])
 
     return df
+
+
+def candles(df: pd.DataFrame) -> Iterator[Candle]:
+    """Iterate a DataFrame from :func:`csv` as :class:`Candle` objects.
+
+    Columns are extracted once as plain Python lists instead of boxing
+    every row, which keeps bulk replays (backtests, warm-up) cheap.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        OHLCV DataFrame with a DatetimeIndex.
+
+    Returns
+    -------
+    Iterator[Candle]
+        One candle per row, in index order.
+    """
+    columns = df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=np.float64)
+    # map() calls the dataclass constructor positionally, column by column,
+    # with no per-row tuple or helper call in between.
+    yield from map(
+        Candle,
+        df.index.astype(str),
+        *columns.T.tolist(),
+        df.index.as_unit("ns").asi8.tolist(),
+    )
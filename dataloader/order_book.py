@@ -12,7 +12,7 @@ def csv(path: str) -> pd.DataFrame:
     Parameters
     ----------
     path : str
-        Path to the CSV file.
+        Path to the CSV file (``.csv.gz`` is decompressed transparently).
 
     Returns
     -------
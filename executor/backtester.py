@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
 import numpy as np
 import pandas as pd
 
@@ -13,6 +13,15 @@ from logger import log
 from monitor.measurement import BacktestMeasurement
 from strategy.action import NoAction, Open
 
+_UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    # Stdlib parse avoids building a pd.Timestamp per candle.
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
 
 class Backtester(NoActionExecution):
     """Streaming backtester that feeds candles to a strategy.
@@ -36,12 +45,16 @@ class Backtester(NoActionExecution):
     ----------
     strategy
         Strategy instance whose ``ack`` method returns an Action.
+    expected_bars : int
+        Number of candles the history buffers are sized for up front.
+        Pass the replay length to avoid any growth during the run.
     """
 
     def __init__(
         self,
         strategy,
         influx_client: InfluxClient | None = None,
+        expected_bars: int = 200_000,
     ) -> None:
         self._strategy = strategy
         self._influx_client = influx_client
@@ -49,9 +62,17 @@ class Backtester(NoActionExecution):
         self._backtest_measurement: BacktestMeasurement | None = None
         if self._influx_client is not None:
             self._backtest_measurement = BacktestMeasurement()
-        self._equity_history: list[tuple[str, float]] = []
-        self._drawdown_history: list[tuple[str, float]] = []
-        self._sharpe_history: list[tuple[str, float]] = []
+        # Columnar history: one preallocated array per field, indexed by bar.
+        capacity = max(int(expected_bars), 1)
+        self._bars: int = 0
+        self._timestamp_history = np.empty(capacity, dtype=np.int64)
+        self._equity_history = np.empty(capacity, dtype=np.float64)
+        self._drawdown_history = np.empty(capacity, dtype=np.float64)
+        self._sharpe_history = np.empty(capacity, dtype=np.float64)
+        self._index_cache: pd.DatetimeIndex | None = None
+        # Timezone of the replayed timestamps (None when naive), restored on
+        # the curve index since the history stores UTC epoch nanoseconds.
+        self._index_tz: tzinfo | None = None
         self._peak_equity: float | None = None
         self._prev_equity: float | None = None
         self._first_ts_ns: int | None = None
@@ -63,7 +84,7 @@ class Backtester(NoActionExecution):
     def ack(self, candle: Candle) -> None:
         action = self._strategy.ack(candle)
 
-        if isinstance(action, Open):
+        if action.__class__ is Open:
             action.position.price = candle.close
 
         self._strategy.confirm(action)
@@ -72,6 +93,7 @@ class Backtester(NoActionExecution):
 
         if self._first_ts_ns is None:
             self._first_ts_ns = timestamp_ns
+            self._index_tz = _parse_timestamp(candle.timestamp).tzinfo
         self._last_ts_ns = timestamp_ns
 
         if self._prev_equity is not None and self._prev_equity != 0:
@@ -90,9 +112,14 @@ class Backtester(NoActionExecution):
         drawdown = float((equity - peak) / peak) if peak > 0 else 0.0
         sharpe_ratio = self._current_sharpe_ratio()
 
-        self._equity_history.append((candle.timestamp, equity))
-        self._drawdown_history.append((candle.timestamp, drawdown))
-        self._sharpe_history.append((candle.timestamp, sharpe_ratio))
+        i = self._bars
+        if i == len(self._equity_history):
+            self._grow_history()
+        self._timestamp_history[i] = timestamp_ns
+        self._equity_history[i] = equity
+        self._drawdown_history[i] = drawdown
+        self._sharpe_history[i] = sharpe_ratio
+        self._bars = i + 1
         self._write_influx(
             timestamp_ns=timestamp_ns,
             equity=equity,
@@ -104,17 +131,36 @@ class Backtester(NoActionExecution):
         if self._influx_client is not None:
             self._influx_client.close()
 
+    def _grow_history(self) -> None:
+        capacity = len(self._equity_history) * 2
+        log.warn("Backtest history buffer full, growing to %d bars", capacity)
+        self._timestamp_history = np.resize(self._timestamp_history, capacity)
+        self._equity_history = np.resize(self._equity_history, capacity)
+        self._drawdown_history = np.resize(self._drawdown_history, capacity)
+        self._sharpe_history = np.resize(self._sharpe_history, capacity)
+
     # -- metrics ------------------------------------------------------------
 
+    def _index(self) -> pd.DatetimeIndex:
+        """Timestamp index shared by all curves, rebuilt only after new bars."""
+        n = self._bars
+        if self._index_cache is None or len(self._index_cache) != n:
+            index = pd.DatetimeIndex(
+                self._timestamp_history[:n].astype("datetime64[ns]"),
+                name="timestamp",
+            )
+            if self._index_tz is not None:
+                index = index.tz_localize(_UTC).tz_convert(self._index_tz)
+            self._index_cache = index
+        return self._index_cache
+
+    def _series(self, values: np.ndarray, name: str) -> pd.Series:
+        return pd.Series(values[:self._bars].copy(), index=self._index(), name=name)
+
     @property
     def equity_curve(self) -> pd.Series:
         """Equity curve as a time-indexed Series."""
-        timestamps, equities = (list(x) for x in zip(*self._equity_history)) if self._equity_history else ([], [])
-        return pd.Series(
-            equities,
-            index=pd.DatetimeIndex(timestamps, name="timestamp"),
-            name="equity",
-        )
+        return self._series(self._equity_history, "equity")
 
     @property
     def returns(self) -> pd.Series:
@@ -124,29 +170,19 @@ class Backtester(NoActionExecution):
     @property
     def drawdown_curve(self) -> pd.Series:
         """Per-candle drawdown history as a time-indexed Series."""
-        timestamps, values = (list(x) for x in zip(*self._drawdown_history)) if self._drawdown_history else ([], [])
-        return pd.Series(
-            values,
-            index=pd.DatetimeIndex(timestamps, name="timestamp"),
-            name="drawdown",
-        )
+        return self._series(self._drawdown_history, "drawdown")
 
     @property
     def sharpe_curve(self) -> pd.Series:
         """Per-candle annualized Sharpe history as a time-indexed Series."""
-        timestamps, values = (list(x) for x in zip(*self._sharpe_history)) if self._sharpe_history else ([], [])
-        return pd.Series(
-            values,
-            index=pd.DatetimeIndex(timestamps, name="timestamp"),
-            name="sharpe_ratio",
-        )
+        return self._series(self._sharpe_history, "sharpe_ratio")
 
     @property
     def max_drawdown(self) -> float:
         """Maximum drawdown as a negative fraction (e.g. -0.05 = 5%)."""
-        if not self._drawdown_history:
+        if self._bars == 0:
             return 0.0
-        return float(min(dd for _, dd in self._drawdown_history))
+        return float(self._drawdown_history[:self._bars].min())
 
     @property
     def sharpe_ratio(self) -> float:
@@ -196,7 +232,10 @@ class Backtester(NoActionExecution):
     def _timestamp_ns(self, candle: Candle) -> int:
         if candle.timestamp_ns is not None:
             return int(candle.timestamp_ns)
-        return int(pd.to_datetime(candle.timestamp, utc=True).value)
+        dt = _parse_timestamp(candle.timestamp)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=_UTC)
+        return (dt - _EPOCH) // _ONE_MICROSECOND * 1000
 
     def _current_sharpe_ratio(self) -> float:
         if self._return_count < 2:
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 
+from dataloader import ohlc as ohlc_loader
 from dataloader.ohlc import Candle
 from executor.noaction import NoActionExecution
 from logger import log
@@ -19,6 +20,35 @@ if TYPE_CHECKING:
     from client.okx import Client
 
 
+# Contract value (base currency per contract) assumed by the client-less
+# simulation path, where there is no instrument spec to read.
+_DEFAULT_CONTRACT_VALUE = 0.01
+
+# Spot instruments have no contract spec; one unit is one unit of base
+# currency.
+_SPOT_CONTRACT_VALUE = 1.0
+
+
+def _noop() -> None:
+    pass
+
+
+def _instrument_type(instrument: str) -> str:
+    """OKX ``instType`` implied by an instrument ID.
+
+    ``ETH-USDT-SWAP`` → ``SWAP``, ``BTC-USD-250627`` → ``FUTURES``,
+    ``BTC-USD-250627-50000-C`` → ``OPTION``, anything else → ``SPOT``.
+    """
+    parts = instrument.split("-")
+    if parts[-1] == "SWAP":
+        return "SWAP"
+    if len(parts) == 5:
+        return "OPTION"
+    if len(parts) == 3 and parts[2].isdigit():
+        return "FUTURES"
+    return "SPOT"
+
+
 class ExecutionError(Exception):
     """Raised when exchange execution fails."""
 
@@ -45,6 +75,10 @@ class OkxExcutor(NoActionExecution):
     ohlc : pd.DataFrame, optional
         Pre-loaded OHLCV data fed to the strategy on init so it has
         enough history to generate signals immediately.
+    contract_value : float, optional
+        Base-currency amount per contract.  Looked up once from the
+        instrument spec via *okx* when omitted; construction fails with
+        :class:`ExecutionError` if that lookup does not yield a value.
     """
 
     def __init__(
@@ -55,6 +89,7 @@ class OkxExcutor(NoActionExecution):
         okx: "Client | None" = None,
         ohlc: pd.DataFrame | None = None,
         influx_client: "InfluxClient | None" = None,
+        contract_value: float | None = None,
     ) -> None:
         self._okx = okx
         self._strategy = strategy
@@ -66,26 +101,43 @@ class OkxExcutor(NoActionExecution):
         self._instrument = instrument
         self._leverage = leverage
         self._margin_mode = "cross"
-        self._leverage_set = False
+        if contract_value is None:
+            contract_value = self._fetch_contract_value()
+        self._contract_value = contract_value
+        self._ensure_leverage = self._set_leverage_once
+        self._handlers = {
+            Open: self._handle_open,
+            Close: self._handle_close,
+            Adjust: self._handle_adjust,
+        }
+        self._last_dispatched_ts: str | None = None
         starting_equity = float(self._strategy.current_equity())
 
         log.info(
-            f"Future executor: equity={starting_equity:.2f}, "
-            f"instrument={self._instrument}, leverage={self._leverage}x, "
-            f"preloaded={len(ohlc) if ohlc is not None else 0} bars"
+            "Future executor: equity=%.2f, instrument=%s, leverage=%sx, preloaded=%d bars",
+            starting_equity,
+            self._instrument,
+            self._leverage,
+            len(ohlc) if ohlc is not None else 0,
         )
 
         # Warm up strategy with pre-loaded historical data
         if ohlc is not None and len(ohlc) > 0:
-            for _, row in ohlc.iterrows():
-                c = Candle.from_series(row)
+            for c in ohlc_loader.candles(ohlc):
                 action = self._strategy.ack(c)
                 self._strategy.confirm(action)
 
     def ack(self, candle: Candle) -> None:
+        # The feed can deliver the same closed bar more than once (e.g. the
+        # snapshot pushed after a reconnect); only the first is dispatched.
+        if candle.timestamp == self._last_dispatched_ts:
+            log.debug("Skipping duplicate candle %s", candle.timestamp)
+            return
+        self._last_dispatched_ts = candle.timestamp
+
         action = self._strategy.ack(candle)
-        if not isinstance(action, NoAction):
-            log.info(f"strat action [{candle.timestamp}]: {action}")
+        if action.__class__ is not NoAction:
+            log.info("strat action [%s]: %s", candle.timestamp, action)
         self.execute(action, candle)
         self._strategy.confirm(action)
         position = self._strategy.current_position()
@@ -99,74 +151,101 @@ class OkxExcutor(NoActionExecution):
 
     def execute(self, action: Action, candle: Candle) -> None:
         """Execute a strategy action against the current candle."""
-        okx = self._okx
+        # Most candles produce NoAction; exact class check skips the MRO walk.
+        if action.__class__ is NoAction:
+            return
+
+        self._ensure_leverage()
+        handler = self._handlers.get(action.__class__)
+        if handler is not None:
+            handler(action, float(candle.close))
 
-        # Configure leverage on the exchange once
-        if okx and self._instrument and not self._leverage_set:
-            okx.set_leverage(
+    def _handle_close(self, action: Close, price: float) -> None:
+        try:
+            close_size = action.position.size if action.position is not None else 0.0
+            close_result = self._close_position(
+                price=price,
                 instrument=self._instrument,
-                leverage=self._leverage,
-                margin_mode=self._margin_mode,
-                session_id=self._session_id,
+                close_size=close_size,
             )
-            self._leverage_set = True
-
-        if isinstance(action, NoAction):
+            if close_result is not None:
+                action.price = close_result
+        except ExecutionError:
             return
 
-        price = float(candle.close)
+    def _handle_open(self, action: Open, price: float) -> None:
         instrument = self._instrument
-
-        if isinstance(action, Close):
+        prev_position = self._strategy.current_position()
+        if not prev_position.is_flat:
             try:
-                close_size = action.position.size if action.position is not None else 0.0
                 close_result = self._close_position(
                     price=price,
                     instrument=instrument,
-                    close_size=close_size,
+                    close_size=prev_position.size,
                 )
                 if close_result is not None:
-                    action.price = close_result
+                    action.close_price = close_result
             except ExecutionError:
                 return
-            return
 
-        if isinstance(action, Open):
-            prev_position = self._strategy.current_position()
-            if not prev_position.is_flat:
-                try:
-                    close_result = self._close_position(
-                        price=price,
-                        instrument=instrument,
-                        close_size=prev_position.size,
-                    )
-                    if close_result is not None:
-                        action.close_price = close_result
-                except ExecutionError:
-                    return
-
-            pos = action.position
-            equity = float(self._strategy.current_equity())
-            position_value = equity * pos.size
-            entry_price = price
-
-            if okx and instrument:
-                try:
-                    entry_price = self._execute_open(
-                        instrument=instrument,
-                        position=int(pos.side),
-                        position_value=position_value,
-                        reference_price=price,
-                    )
-                except ExecutionError:
-                    return
-
-            # Report effective fill price back to strategy in confirm(action)
-            pos.price = entry_price
-            return
+        pos = action.position
+        equity = float(self._strategy.current_equity())
+        position_value = equity * pos.size
+        entry_price = price
 
-        if isinstance(action, Adjust):
-            return
+        if self._okx and instrument:
+            try:
+                entry_price = self._execute_open(
+                    instrument=instrument,
+                    position=int(pos.side),
+                    position_value=position_value,
+                    reference_price=price,
+                )
+            except ExecutionError:
+                return
+
+        # Report effective fill price back to strategy in confirm(action)
+        pos.price = entry_price
+
+    def _handle_adjust(self, action: Adjust, price: float) -> None:
+        return
+
+    def _fetch_contract_value(self) -> float:
+        """Read ``ctVal`` for the instrument.
+
+        Without a client (simulation) the default is used, and spot
+        instruments, which have no contract spec, use 1.  Otherwise a
+        failed lookup is fatal: guessing would mis-size every live order.
+        """
+        if self._okx is None or not self._instrument:
+            return _DEFAULT_CONTRACT_VALUE
+        instrument_type = _instrument_type(self._instrument)
+        if instrument_type == "SPOT":
+            return _SPOT_CONTRACT_VALUE
+        try:
+            spec = self._okx.instrument(
+                self._instrument, instrument_type, session_id=self._session_id,
+            )
+        except Exception as e:
+            log.error("OKX instrument lookup failed for %s: %s", self._instrument, e)
+            raise ExecutionError("instrument lookup failed") from e
+        value = self._safe_float(spec.get("ctVal"))
+        if value is None or value <= 0:
+            log.error("OKX instrument %s has no usable ctVal: %r", self._instrument, spec)
+            raise ExecutionError("contract value unavailable")
+        return value
+
+    def _set_leverage_once(self) -> None:
+        """Configure leverage on the exchange, then become a no-op."""
+        if self._okx and self._instrument:
+            self._okx.set_leverage(
+                instrument=self._instrument,
+                leverage=self._leverage,
+                margin_mode=self._margin_mode,
+                session_id=self._session_id,
+            )
+        # Also without a client: the check itself should only run once.
+        self._ensure_leverage = _noop
 
     def _close_position(
         self,
@@ -195,7 +274,7 @@ class OkxExcutor(NoActionExecution):
                 session_id=self._session_id,
             )
         except Exception as e:
-            log.error(f"OKX close position failed: {e}")
+            log.error("OKX close position failed: %s", e)
             raise ExecutionError("close position failed") from e
 
     def _execute_open(
@@ -207,17 +286,19 @@ class OkxExcutor(NoActionExecution):
         max_retries: int = 3,
         retry_delay: float = 2.0,
     ) -> float:
-        """Open a new futures position on OKX with retry on failure."""
-        import time
+        """Open a new futures position on OKX with retry on failure.
 
+        Retries back off exponentially: *retry_delay*, then twice that, etc.
+        """
         client = self._okx
         if client is None:
             raise ExecutionError("okx client missing")
 
         side = "buy" if position == 1 else "sell"
         price = reference_price or 1
-        contracts = int(position_value / price / 0.01) or 1
+        contracts = max(1, int(position_value / (price * self._contract_value)))
         size = str(contracts)
+        backoff = tuple(retry_delay * 2 ** i for i in range(max_retries - 1))
 
         for attempt in range(1, max_retries + 1):
             try:
@@ -234,11 +315,17 @@ class OkxExcutor(NoActionExecution):
                     order_price = reference_price
                 return order_price
             except Exception as e:
-                log.error(f"OKX order failed (attempt {attempt}/{max_retries}): {type(e).__name__}: {e}")
+                log.error(
+                    "OKX order failed (attempt %d/%d): %s: %s",
+                    attempt,
+                    max_retries,
+                    type(e).__name__,
+                    e,
+                )
                 if attempt < max_retries:
-                    time.sleep(retry_delay)
+                    time.sleep(backoff[attempt - 1])
 
-        log.error(f"OKX order gave up after {max_retries} attempts")
+        log.error("OKX order gave up after %d attempts", max_retries)
         raise ExecutionError("open position failed")
 
     @staticmethod
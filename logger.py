@@ -11,6 +11,11 @@ Usage
     log.warn("Drawdown exceeded threshold")
     log.error("Order failed")
 
+Extra positional arguments are %-formatted only when the message is
+actually emitted, so filtered calls cost no string formatting::
+
+    log.debug("price=%f ts=%s", price, ts)
+
 Log levels (lowest → highest):
     DEBUG < INFO < WARN < ERROR < SILENT
 
@@ -30,6 +35,10 @@ _LEVELS = {
     "ERROR": 3,
     "SILENT": 4,
 }
+_DEBUG = _LEVELS["DEBUG"]
+_INFO = _LEVELS["INFO"]
+_WARN = _LEVELS["WARN"]
+_ERROR = _LEVELS["ERROR"]
 
 
 class Logger:
@@ -49,24 +58,24 @@ class Logger:
         self._level_name = level
 
     def _log(self, tag: str, msg: str) -> None:
-        ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        ts = datetime.now(timezone.utc).time().isoformat(timespec="seconds")
         print(f"{ts} [{tag}] {msg}")
 
-    def debug(self, msg: str) -> None:
-        if self._level <= _LEVELS["DEBUG"]:
-            self._log("DEBUG", msg)
+    def debug(self, msg: str, *args: object) -> None:
+        if self._level <= _DEBUG:
+            self._log("DEBUG", msg % args if args else msg)
 
-    def info(self, msg: str) -> None:
-        if self._level <= _LEVELS["INFO"]:
-            self._log("INFO", msg)
+    def info(self, msg: str, *args: object) -> None:
+        if self._level <= _INFO:
+            self._log("INFO", msg % args if args else msg)
 
-    def warn(self, msg: str) -> None:
-        if self._level <= _LEVELS["WARN"]:
-            self._log("WARN", msg)
+    def warn(self, msg: str, *args: object) -> None:
+        if self._level <= _WARN:
+            self._log("WARN", msg % args if args else msg)
 
-    def error(self, msg: str) -> None:
-        if self._level <= _LEVELS["ERROR"]:
-            self._log("ERROR", msg)
+    def error(self, msg: str, *args: object) -> None:
+        if self._level <= _ERROR:
+            self._log("ERROR", msg % args if args else msg)
 
 
 # Singleton – import and use directly: from logger import log
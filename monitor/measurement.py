@@ -3,28 +3,62 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import ClassVar
 
 
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", " ": "\\ ", ",": "\\,", "=": "\\="})
+
+
 def _escape(value: str) -> str:
-    return value.replace("\\", "\\\\").replace(" ", "\\ ").replace(",", "\\,").replace("=", "\\=")
+    return value.translate(_ESCAPE_TABLE)
+
+
+def _format_str(val: object) -> str:
+    escaped = str(val).replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+# Exact-type dispatch, so bool never falls through to int.
+_FIELD_FORMATTERS = {
+    bool: lambda v: "true" if v else "false",
+    int: lambda v: f"{v}i",
+    float: repr,
+    str: _format_str,
+}
+
+
+def _format_value(val: float | int | str | bool) -> str:
+    fmt = _FIELD_FORMATTERS.get(type(val))
+    if fmt is not None:
+        return fmt(val)
+    # Subclasses (e.g. numpy scalars) take the slower isinstance path.
+    if isinstance(val, int):
+        return f"{int(val)}i"
+    if isinstance(val, float):
+        return repr(float(val))
+    return _format_str(val)
+
+
+@lru_cache(maxsize=256)
+def _line_prefix(measurement: str, tags: tuple[tuple[str, str], ...]) -> str:
+    """Escaped ``measurement[,tag=value...]`` head of a line-protocol row.
+
+    Tags are fixed per measurement template, so the sort and escaping
+    run once per distinct tag set rather than once per point.
+    """
+    tag_segment = "".join(
+        f",{_escape(str(key))}={_escape(str(val))}"
+        for key, val in sorted(tags)
+        if val != ""
+    )
+    return _escape(measurement) + tag_segment
 
 
 def _format_fields(fields: dict[str, float | int | str | bool]) -> str:
-    parts: list[str] = []
-    for key, val in fields.items():
-        field_key = _escape(key)
-        if isinstance(val, bool):
-            field_val = "true" if val else "false"
-        elif isinstance(val, int) and not isinstance(val, bool):
-            field_val = f"{val}i"
-        elif isinstance(val, float):
-            field_val = repr(val)
-        else:
-            escaped = str(val).replace('"', '\\"')
-            field_val = f'"{escaped}"'
-        parts.append(f"{field_key}={field_val}")
-    return ",".join(parts)
+    return ",".join(
+        _escape(key) + "=" + _format_value(val) for key, val in fields.items()
+    )
 
 
 class MeasurementValue:
@@ -42,15 +76,12 @@ class MeasurementValue:
         self._field_values = field_values
 
     def to_line(self) -> str:
-        tag_segment = ""
-        if self.tags:
-            sorted_tags = sorted((k, v) for k, v in self.tags.items() if v != "")
-            if sorted_tags:
-                tag_segment = "," + ",".join(
-                    f"{_escape(str(key))}={_escape(str(val))}" for key, val in sorted_tags
-                )
+        prefix = _line_prefix(
+            self.measurement,
+            tuple(self.tags.items()) if self.tags else (),
+        )
         field_segment = _format_fields(self._field_values)
-        return f"{_escape(self.measurement)}{tag_segment} {field_segment} {self.timestamp_ns}"
+        return f"{prefix} {field_segment} {self.timestamp_ns}"
 
 
 @dataclass(slots=True)
@@ -82,18 +113,14 @@ class BacktestMeasurement(NoValueMeasurement):
         equity: float,
         sharpe_ratio: float,
     ) -> MeasurementValue:
-        values: dict[str, float | int | str | bool] = {
-            "backtest_id": backtest_id,
-            "drawdown": drawdown,
-            "equity": equity,
-            "sharpe_ratio": sharpe_ratio,
-        }
-
         return MeasurementValue(
             measurement=self.measurement,
             timestamp_ns=timestamp_ns,
             tags=self.tags,
-            **values,
+            backtest_id=backtest_id,
+            drawdown=drawdown,
+            equity=equity,
+            sharpe_ratio=sharpe_ratio,
         )
 
 
@@ -117,18 +144,14 @@ class TradeMeasurement(NoValueMeasurement):
         position_side: str,
         position_size: float,
     ) -> MeasurementValue:
-        values: dict[str, float | int | str | bool] = {
-            "session_id": session_id,
-            "equity": equity,
-            "position_side": position_side,
-            "position_size": position_size,
-        }
-
         return MeasurementValue(
             measurement=self.measurement,
             timestamp_ns=timestamp_ns,
             tags=self.tags,
-            **values,
+            session_id=session_id,
+            equity=equity,
+            position_side=position_side,
+            position_size=position_size,
         )
 
 
@@ -156,14 +179,10 @@ class ClientRequestMeasurement(NoValueMeasurement):
         session_id: str,
         status_code: int,
     ) -> MeasurementValue:
-        values: dict[str, float | int | str | bool] = {
-            "session_id": session_id,
-            "status_code": status_code,
-        }
-
         return MeasurementValue(
             measurement=self.measurement,
             timestamp_ns=timestamp_ns,
             tags=self.tags,
-            **values,
+            session_id=session_id,
+            status_code=status_code,
         )
@@ -1,20 +1,109 @@
 """Moving-average crossover (MACROSS) strategy using EMA.
 
-Uses pandas_ta for EMA calculation, which matches TradingView / OKX charts
-(SMA-seeded, α = 2 / (period + 1)).
-"""
-
-import os
-import pandas as pd
-
-# Avoid numba cache failures in some Python environments during pandas_ta import.
-os.environ.setdefault("NUMBA_DISABLE_JIT", "1")
-import pandas_ta as ta
+EMAs match TradingView / OKX charts (SMA-seeded, α = 2 / (period + 1)) and
+are computed together with the crossover signal in one Numba pass.
+"""
+
+import numpy as np
+import pandas as pd
+from numba import njit, types
 
 from logger import log
 from strategy.action import Position
 
 
+# Explicit signature: the kernel is compiled (or loaded from the on-disk
+# cache) when the module is imported, so the first live candle never waits
+# on the JIT.  The input is declared read-only because pandas may hand back
+# a read-only view; writable arrays convert to it implicitly.  A second,
+# writable variant would make every writable input ambiguous.
+_EMA_CROSS_SIGNATURE = types.Tuple((
+    types.float64[::1], types.float64[::1], types.int8[::1], types.int8[::1]
+))(types.Array(types.float64, 1, "C", readonly=True), types.int64, types.int64)
+
+
+def _jit(signature):
+    """Eagerly compile with Numba's on-disk cache, or without it if unusable.
+
+    This module is imported by every setup, so a cache that cannot be
+    located, written or loaded (read-only install, stale or foreign cache
+    files) must only cost compile time, never the import.
+    """
+    def decorate(func):
+        try:
+            return njit(signature, cache=True)(func)
+        except Exception as e:
+            log.warn("Numba cache unusable for %s, compiling without it: %s", func.__name__, e)
+            return njit(signature)(func)
+    return decorate
+
+
+@_jit(_EMA_CROSS_SIGNATURE)
+def _ema_cross(close, short, long):
+    """Fused SMA-seeded EMAs + crossover signal + held position.
+
+    Bars before an EMA is seeded are NaN; the first bar where both EMAs
+    exist never fires a signal (matching the NaN-shift semantics of the
+    pandas implementation this replaces).
+    """
+    n = close.shape[0]
+    ema_s = np.empty(n)
+    ema_l = np.empty(n)
+    # Signal / position are only ever -1, 0 or +1.
+    signal = np.zeros(n, dtype=np.int8)
+    position = np.zeros(n, dtype=np.int8)
+
+    alpha_s = 2.0 / (short + 1)
+    alpha_l = 2.0 / (long + 1)
+    beta_s = 1.0 - alpha_s
+    beta_l = 1.0 - alpha_l
+
+    # Single pass: both EMAs and the crossover stay in registers.
+    sum_s = 0.0
+    sum_l = 0.0
+    es = 0.0
+    el = 0.0
+    prev_diff = 0.0
+    held = 0
+    for i in range(n):
+        c = close[i]
+        bar = i + 1
+
+        if bar < short:
+            sum_s += c
+            ema_s[i] = np.nan
+        elif bar == short:
+            es = (sum_s + c) / short
+            ema_s[i] = es
+        else:
+            es = alpha_s * c + beta_s * es
+            ema_s[i] = es
+
+        if bar < long:
+            sum_l += c
+            ema_l[i] = np.nan
+            continue
+        if bar == long:
+            el = (sum_l + c) / long
+            ema_l[i] = el
+            prev_diff = es - el
+            continue
+        el = alpha_l * c + beta_l * el
+        ema_l[i] = el
+
+        diff = es - el
+        if diff > 0 and prev_diff <= 0:
+            signal[i] = 1
+            held = 1
+        elif diff < 0 and prev_diff >= 0:
+            signal[i] = -1
+            held = -1
+        position[i] = held
+        prev_diff = diff
+
+    return ema_s, ema_l, signal, position
+
+
 class MACross:
     """EMA-based moving-average crossover strategy.
 
@@ -40,6 +129,24 @@ class MACross:
         Defaults to ``"close"``.
     """
 
+    __slots__ = (
+        "short",
+        "long",
+        "source",
+        "last_position",
+        "_alpha_s",
+        "_alpha_l",
+        "_beta_s",
+        "_beta_l",
+        "_ema_s",
+        "_ema_l",
+        "_prev_diff",
+        "_position",
+        "_bar_count",
+        "_sum_s",
+        "_sum_l",
+    )
+
     def __init__(self, short: int | str = 10, long: int | str = 20, source: str = "close"):
         self.short = int(short)
         self.long = int(long)
@@ -54,12 +161,16 @@ class MACross:
         # Incremental EMA state for step()
         self._alpha_s = 2.0 / (self.short + 1)
         self._alpha_l = 2.0 / (self.long + 1)
+        self._beta_s = 1.0 - self._alpha_s
+        self._beta_l = 1.0 - self._alpha_l
         self._ema_s: float = 0.0
         self._ema_l: float = 0.0
         self._prev_diff: float = 0.0
         self._position: int = 0
         self._bar_count: int = 0
-        self._close_buffer: list[float] = []
+        # Running sums for the SMA seeds of each EMA
+        self._sum_s: float = 0.0
+        self._sum_l: float = 0.0
 
     def __repr__(self) -> str:
         return f"MACross(short={self.short}, long={self.long}, source={self.source})"
@@ -67,55 +178,69 @@ class MACross:
     def step(self, close: float) -> int:
         """Incrementally update EMAs and return position (+1/-1/0).
 
-        Matches the SMA-seeded EMA used by pandas_ta / TradingView.
+        Matches the SMA-seeded EMA used by :meth:`generate_signals` / TradingView.
         """
-        self._bar_count += 1
+        bar = self._bar_count + 1
+        self._bar_count = bar
+        if bar <= self.long:
+            return self._seed_step(bar, close)
+
+        # Steady state: both EMAs seeded. Work on locals, store once.
+        ema_s = self._alpha_s * close + self._beta_s * self._ema_s
+        ema_l = self._alpha_l * close + self._beta_l * self._ema_l
+        prev_diff = self._prev_diff
+        position = self._position
+
+        # Crossover detection
+        diff = ema_s - ema_l
+        if diff > 0 and prev_diff <= 0:
+            position = 1
+        elif diff < 0 and prev_diff >= 0:
+            position = -1
+
+        self._ema_s = ema_s
+        self._ema_l = ema_l
+        self._prev_diff = diff
+        self._position = position
+        return position
 
-        # Accumulate prices until long EMA can be seeded
-        if self._bar_count <= self.long:
-            self._close_buffer.append(close)
+    def _seed_step(self, bar: int, close: float) -> int:
+        """Handle bars up to and including the long EMA seed bar."""
+        self._sum_l += close
+        if bar <= self.short:
+            self._sum_s += close
 
         # Seed / update short EMA
-        if self._bar_count < self.short:
+        if bar < self.short:
             return 0
-        elif self._bar_count == self.short:
-            self._ema_s = sum(self._close_buffer) / self.short
+        elif bar == self.short:
+            self._ema_s = self._sum_s / self.short
         else:
-            self._ema_s = self._alpha_s * close + (1 - self._alpha_s) * self._ema_s
+            self._ema_s = self._alpha_s * close + self._beta_s * self._ema_s
 
-        # Seed / update long EMA
-        if self._bar_count < self.long:
+        # Seed long EMA
+        if bar < self.long:
             return 0
-        elif self._bar_count == self.long:
-            self._ema_l = sum(self._close_buffer) / self.long
-            self._close_buffer = []  # free memory
-            self._prev_diff = self._ema_s - self._ema_l
-            return self._position  # stays 0 — no crossover on seed bar
-        else:
-            self._ema_l = self._alpha_l * close + (1 - self._alpha_l) * self._ema_l
+        self._ema_l = self._sum_l / self.long
+        self._prev_diff = self._ema_s - self._ema_l
+        return self._position  # stays 0 — no crossover on seed bar
 
-        # Crossover detection
-        diff = self._ema_s - self._ema_l
-        if diff > 0 and self._prev_diff <= 0:
-            self._position = 1
-        elif diff < 0 and self._prev_diff >= 0:
-            self._position = -1
-        self._prev_diff = diff
-
-        return self._position
-
-    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+    def generate_signals(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """Compute EMA crossover and position signals.
 
         Parameters
         ----------
         df : pd.DataFrame
             OHLCV DataFrame (must contain the column specified by *source*).
+        inplace : bool
+            Add the signal columns to *df* itself and return it.  By default
+            a new frame holding only the signal columns is returned (on
+            *df*'s index); use ``df.join(result)`` to combine them.
 
         Returns
         -------
         pd.DataFrame
-            Copy of *df* with added columns:
+            Frame with the columns:
 
             - ``ema_short`` – short exponential moving average
             - ``ema_long`` – long exponential moving average
@@ -125,25 +250,24 @@ class MACross:
         if self.source not in df.columns:
             raise ValueError(f"Missing required column: '{self.source}'")
 
-        out = df.copy()
-        out["ema_short"] = ta.ema(out[self.source], length=self.short)
-        out["ema_long"] = ta.ema(out[self.source], length=self.long)
+        close = np.ascontiguousarray(df[self.source].to_numpy(dtype=np.float64))
+        ema_s, ema_l, signal, position = _ema_cross(close, self.short, self.long)
 
-        # Detect crossover points only (NaN-safe)
-        diff = out["ema_short"] - out["ema_long"]
-        cross_up = (diff > 0) & (diff.shift(1) <= 0)   # short crosses above long
-        cross_down = (diff < 0) & (diff.shift(1) >= 0)  # short crosses below long
-
-        out["signal"] = 0
-        out.loc[cross_up, "signal"] = 1
-        out.loc[cross_down, "signal"] = -1
-
-        # Hold position between crossovers
-        out["position"] = out["signal"]
-        out["position"] = out["position"].replace(0, pd.NA).ffill().fillna(0).astype(int)
+        columns = {
+            "ema_short": ema_s,
+            "ema_long": ema_l,
+            "signal": signal,
+            "position": position,
+        }
+        if inplace:
+            out = df
+            for name, values in columns.items():
+                out[name] = values
+        else:
+            out = pd.DataFrame(columns, index=df.index)
 
         # Build Position for the latest bar
-        last_pos = int(out["position"].iloc[-1])
+        last_pos = int(position[-1])
         if last_pos == 1:
             self.last_position = Position.long()
         elif last_pos == -1:
@@ -152,10 +276,15 @@ class MACross:
             self.last_position = Position.flat()
 
         # Print EMA values when a crossover fires on the latest bar
-        last_signal = out["signal"].iloc[-1]
+        last_signal = signal[-1]
         if last_signal != 0:
-            log.debug(f"MACross({self.short}/{self.long}) → {self.last_position.side.name}  "
-                     f"ema_short={out['ema_short'].iloc[-1]:.4f}  "
-                     f"ema_long={out['ema_long'].iloc[-1]:.4f}")
+            log.debug(
+                "MACross(%d/%d) → %s  ema_short=%.4f  ema_long=%.4f",
+                self.short,
+                self.long,
+                self.last_position.side.name,
+                ema_s[-1],
+                ema_l[-1],
+            )
 
         return out
@@ -22,6 +22,10 @@ class Side(IntEnum):
         return self.name
 
 
+# Side for sign 0, +1 and -1 (negative index wraps to the end).
+_SIDE_BY_SIGN = (Side.FLAT, Side.LONG, Side.SHORT)
+
+
 @dataclass(slots=True)
 class Position:
     """A single position decision produced by a strategy.
@@ -77,7 +81,15 @@ class Position:
 
     @classmethod
     def flat(cls) -> Position:
-        """Create a FLAT (close) position."""
+        """Return the shared FLAT (close) position.
+
+        Every flat position is identical, so one read-only instance is
+        reused rather than allocating per bar; assigning to its fields
+        raises ``AttributeError``.  Build ``Position(side=Side.FLAT,
+        size=0.0)`` for a flat position that will be modified.
+        """
+        if cls is Position:
+            return _FLAT
         return cls(side=Side.FLAT, size=0.0)
 
     # -- conversion helpers ------------------------------------------------
@@ -95,11 +107,13 @@ class Position:
             +1 long, −1 short, 0 flat.  Fractional values (e.g. 0.04)
             are interpreted as scaled long positions.
         """
-        if position > 0:
-            return cls(side=Side.LONG, size=abs(position))
-        elif position < 0:
-            return cls(side=Side.SHORT, size=abs(position))
-        return cls.flat()
+        # Index by sign (-1 wraps to SHORT) instead of branching, and skip
+        # the IntEnum value lookup.  NaN compares false both ways, so it is
+        # flat too.
+        sign = (position > 0) - (position < 0)
+        if not sign:
+            return cls.flat()
+        return cls(side=_SIDE_BY_SIGN[sign], size=abs(position))
 
     @property
     def value(self) -> float:
@@ -112,7 +126,8 @@ class Position:
 
     @property
     def is_flat(self) -> bool:
-        return self.side == Side.FLAT
+        # Side.FLAT == 0; truth-testing the int skips the enum member lookup.
+        return not self.side
 
     def __repr__(self) -> str:
         parts = [f"{self.side.name}"]
@@ -127,6 +142,37 @@ class Position:
         return f"Position({', '.join(parts)})"
 
 
+class _SharedFlatPosition(Position):
+    """Read-only FLAT position shared by every :meth:`Position.flat` call.
+
+    Writes raise instead of silently leaking into every later flat
+    position.  Compares equal to a plain ``Position`` with the same fields.
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        for name, value in zip(Position.__slots__, (Side.FLAT, 0.0, None, None, None)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(
+            "Position.flat() is shared and read-only; "
+            "build Position(side=Side.FLAT, size=0.0) to modify one"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        self.__setattr__(name, None)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in Position.__slots__)
+
+
+_FLAT = _SharedFlatPosition()
+
+
 # ---------------------------------------------------------------------------
 # Actions
 # ---------------------------------------------------------------------------
@@ -134,12 +180,16 @@ class Position:
 
 class Action:
     """Base class for all strategy actions."""
-    pass
+
+    # Empty slots so ``slots=True`` subclasses don't inherit a ``__dict__``.
+    __slots__ = ()
 
 
 class NoAction(Action):
     """No action — hold current state."""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return "NoAction()"
 
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import deque
 
 from dataloader.ohlc import Candle
 from strategy.action import Action, NoAction, Open, Close, Adjust, Position
 from strategy.noaction import NoActionStrategy
 
+# NoAction carries no state, so one instance serves every hold.
+_NO_ACTION = NoAction()
+
 
 class DrawdownPositionSize(NoActionStrategy):
     """Scale position size by drawdown level.
@@ -55,11 +59,18 @@ class DrawdownPositionSize(NoActionStrategy):
         self.thresh_hold: dict[float, float] = {
             float(k): v for k, v in sorted(size.items(), reverse=True)
         }
+        # Ascending copies for a binary-search lookup per candle.
+        self._dd_levels: list[float] = sorted(self.thresh_hold)
+        self._dd_scales: list[float] = [self.thresh_hold[k] for k in self._dd_levels]
 
         # -- incremental state -----------------------------------------------
         self._prev_close: float | None = None
         self._scaled_position: float = 0.0
-        self._equity_window: deque[float] = deque([equity], maxlen=drawdown_window)
+        # Rolling equity peak over the last *drawdown_window* values as a
+        # monotonic deque of (tick, equity): values only decrease from
+        # front to back, so the front is the window max.
+        self._tick: int = 0
+        self._peak_window: deque[tuple[int, float]] = deque([(0, equity)])
 
 
     def __repr__(self) -> str:
@@ -71,38 +82,45 @@ class DrawdownPositionSize(NoActionStrategy):
     def ack(self, candle: Candle) -> Action:
         """Process candle and decide the next action."""
         close = float(candle.close)
+        signals = self.signals
 
         # Step signals to get current positions
-        for s in self.signals:
+        for s in signals:
             s.step(close)
 
-        # Update equity & drawdown from candle
-        if self._prev_close is not None and self._prev_close != 0:
-            bar_ret = (close - self._prev_close) / self._prev_close
-            self._equity *= 1.0 + self._scaled_position * bar_ret
-            self._equity_window.append(self._equity)
+        # Update equity & drawdown from candle (state read into locals once)
+        equity = self._equity
+        prev_close = self._prev_close
+        if prev_close is not None and prev_close != 0:
+            bar_ret = (close - prev_close) / prev_close
+            equity *= 1.0 + self._scaled_position * bar_ret
+            self._equity = equity
+            self._push_equity(equity)
         self._prev_close = close
 
-        raw_position = float(self.signals[0]._position)
+        raw_position = float(signals[0]._position)
 
         # Scale by current drawdown
-        peak = max(self._equity_window)
-        drawdown_pct = (peak - self._equity) / peak if peak > 0 else 0.0
+        peak = self._peak_window[0][1]
+        drawdown_pct = (peak - equity) / peak if peak > 0 else 0.0
 
-        scale = 1.0
-        for dd_level, dd_scale in self.thresh_hold.items():
-            if drawdown_pct >= dd_level:
-                scale = dd_scale
-                break
+        # Highest threshold not above the current drawdown.
+        i = bisect_right(self._dd_levels, drawdown_pct) - 1
+        scale = self._dd_scales[i] if i >= 0 else 1.0
 
         scaled = raw_position * scale
 
+        # _scaled_position mirrors last_position.value, so an unchanged
+        # target (most candles) needs no Position built to compare.
+        if scaled == self._scaled_position:
+            return _NO_ACTION
+
         # Determine action
         prev = self.last_position
         curr = Position.from_raw(scaled)
 
         if prev.side == curr.side and prev.size == curr.size:
-            return NoAction()
+            return _NO_ACTION
         if prev.is_flat and not curr.is_flat:
             return Open(position=curr)
         if not prev.is_flat and curr.is_flat:
@@ -111,6 +129,17 @@ class DrawdownPositionSize(NoActionStrategy):
             return Open(position=curr)
         return Adjust(position=curr)
 
+    def _push_equity(self, equity: float) -> None:
+        """Add *equity* to the rolling peak window."""
+        self._tick += 1
+        tick = self._tick
+        window = self._peak_window
+        while window and window[-1][1] <= equity:
+            window.pop()
+        window.append((tick, equity))
+        if window[0][0] <= tick - self.drawdown_window:
+            window.popleft()
+
     def confirm(self, action: Action) -> None:
         """Update position tracking with the actual action."""
         if isinstance(action, (Open, Adjust)):
@@ -0,0 +1,45 @@
+"""Tests for strategy positions."""
+
+import unittest
+
+from strategy.action import Position, Side
+
+
+class FlatPositionTest(unittest.TestCase):
+    """Position.flat() is shared, so it must not be mutable."""
+
+    def test_flat_is_shared(self):
+        self.assertIs(Position.flat(), Position.flat())
+        self.assertIs(Position.from_raw(0.0), Position.flat())
+
+    def test_mutating_flat_raises(self):
+        flat = Position.flat()
+        for field, value in (("price", 100.0), ("size", 1.0), ("stop_loss", 90.0)):
+            with self.subTest(field=field):
+                with self.assertRaises(AttributeError):
+                    setattr(flat, field, value)
+
+    def test_failed_mutation_does_not_leak(self):
+        try:
+            Position.flat().price = 100.0
+        except AttributeError:
+            pass
+        flat = Position.flat()
+        self.assertIsNone(flat.price)
+        self.assertEqual(flat.size, 0.0)
+        self.assertEqual(flat.value, 0.0)
+
+    def test_flat_equals_plain_flat_position(self):
+        plain = Position(side=Side.FLAT, size=0.0)
+        self.assertEqual(Position.flat(), plain)
+        self.assertEqual(plain, Position.flat())
+        self.assertNotEqual(Position.flat(), Position.long())
+
+    def test_plain_flat_position_is_mutable(self):
+        plain = Position(side=Side.FLAT, size=0.0)
+        plain.price = 100.0
+        self.assertEqual(plain.price, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for the Binance kline download helpers."""
+
+import csv
+import gzip
+import os
+import random
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest import mock
+
+from client import binance
+
+
+def _ms(year: int, month: int, day: int) -> int:
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _fake_klines(step_ms: int, offset_ms: int = 0, jitter: float = 0.0):
+    """Stand-in for _fetch_klines serving one kline per step in range.
+
+    With *jitter*, each call sleeps a random fraction of it so pool
+    workers finish out of submission order.
+    """
+    calls = []
+
+    def fetch(symbol, interval, start_ms, end_ms, limit):
+        calls.append((start_ms, end_ms))
+        if jitter:
+            time.sleep(random.random() * jitter)
+        first = -(-(start_ms - offset_ms) // step_ms) * step_ms + offset_ms
+        return [
+            [t, "1", "2", "0.5", "1.5", "10"]
+            for t in range(first, end_ms, step_ms)
+        ][:limit]
+
+    return fetch, calls
+
+
+class DownloadRowsTest(unittest.TestCase):
+    """Concurrent page fetches come back in order with no gaps or repeats."""
+
+    STEP_MS = 60_000
+
+    def test_pages_ordered_and_unique_across_pool_batches(self):
+        start = _ms(2025, 1, 1)
+        # Several pool batches of 1000-kline pages, plus a partial last page.
+        n = 1000 * (binance._MAX_WORKERS * 2 + 3) + 250
+        end = start + n * self.STEP_MS
+        fetch, calls = _fake_klines(self.STEP_MS, jitter=0.005)
+        with mock.patch.object(binance, "_fetch_klines", fetch), \
+                ThreadPoolExecutor(binance._MAX_WORKERS) as pool:
+            rows = [
+                row
+                for page in binance._download_rows(pool, "ETHUSDT", "1m", start, end)
+                for row in page
+            ]
+
+        timestamps = [r[0] for r in rows]
+        self.assertEqual(len(timestamps), n)
+        self.assertEqual(len(set(timestamps)), n)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(timestamps[0], "2025-01-01 00:00:00")
+        self.assertEqual(len(calls), -(-n // 1000))
+
+    def test_price_output_spanning_cached_and_partial_months(self):
+        output_dir = tempfile.mkdtemp()
+        fetch, _ = _fake_klines(3_600_000, jitter=0.001)
+        with mock.patch.object(binance, "_fetch_klines", fetch):
+            path = binance.price(
+                "ETH-USDT", "2025-01-20T00:00:00Z", "2025-03-10T00:00:00Z",
+                step="1h", output_dir=output_dir,
+            )
+        with gzip.open(path, "rt", newline="") as f:
+            timestamps = [row[0] for row in csv.reader(f)][1:]
+
+        expected = (_ms(2025, 3, 10) - _ms(2025, 1, 20)) // 3_600_000
+        self.assertEqual(len(timestamps), expected)
+        self.assertEqual(len(set(timestamps)), expected)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(
+            os.listdir(os.path.join(output_dir, "ETHUSDT_1h")), ["2025-02.csv"],
+        )
+
+
+class MonthRowsCacheTest(unittest.TestCase):
+    """A month is cached only once its last candle has closed."""
+
+    # Weekly candles open on Mondays (the epoch was a Thursday).
+    STEP_MS = 7 * 86_400_000
+    OFFSET_MS = 4 * 86_400_000
+    MONTH = datetime(2025, 9, 1, tzinfo=timezone.utc)
+    MONTH_START = _ms(2025, 9, 1)
+    MONTH_END = _ms(2025, 10, 1)
+
+    def setUp(self):
+        self.chunk_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.chunk_dir, "2025-09.csv")
+
+    def rows_at(self, now_ms: int) -> list:
+        fetch, _ = _fake_klines(self.STEP_MS, self.OFFSET_MS)
+        with mock.patch.object(binance, "_fetch_klines", fetch), \
+                mock.patch.object(binance.time, "time", return_value=now_ms / 1000), \
+                ThreadPoolExecutor(2) as pool:
+            return [
+                row
+                for rows in binance._month_rows(
+                    pool, "ETHUSDT", "1w", self.chunk_dir,
+                    self.MONTH, self.MONTH_START, self.MONTH_END,
+                    self.MONTH_START, self.MONTH_END,
+                )
+                for row in rows
+            ]
+
+    def test_month_with_open_trailing_candle_is_not_cached(self):
+        # The week opening Mon 2025-09-29 is still open on 2025-10-03.
+        rows = self.rows_at(_ms(2025, 10, 3))
+        self.assertEqual(rows[-1][0], "2025-09-29 00:00:00")
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_month_is_cached_once_trailing_candle_closed(self):
+        # One full step after the month ends, every candle in it has closed.
+        rows = self.rows_at(_ms(2025, 10, 8))
+        self.assertTrue(os.path.exists(self.cache_path))
+        self.assertEqual(self.rows_at(_ms(2025, 10, 8)), [list(r) for r in rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for the MACross EMA crossover kernel."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from signal.macross import MACross, _ema_cross
+
+
+def _closes(n: int = 200) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return 100 + rng.standard_normal(n).cumsum()
+
+
+class EmaCrossInputTest(unittest.TestCase):
+    """The eagerly compiled kernel accepts every input generate_signals passes."""
+
+    def setUp(self):
+        self.close = _closes()
+        self.expected = _ema_cross(self.close, 5, 17)
+
+    def assertSameResult(self, result):
+        for got, want in zip(result, self.expected):
+            np.testing.assert_array_equal(got, want)
+
+    def test_writable_input(self):
+        self.assertTrue(self.close.flags.writeable)
+        self.assertSameResult(_ema_cross(self.close.copy(), 5, 17))
+
+    def test_read_only_input(self):
+        close = self.close.copy()
+        close.flags.writeable = False
+        self.assertSameResult(_ema_cross(close, 5, 17))
+
+    def test_generate_signals_int_column(self):
+        df = pd.DataFrame({"close": np.arange(1, 40)})
+        out = MACross(5, 17).generate_signals(df)
+        expected = _ema_cross(np.arange(1, 40, dtype=np.float64), 5, 17)
+        np.testing.assert_array_equal(out["ema_long"].to_numpy(), expected[1])
+
+    def test_generate_signals_float_column(self):
+        df = pd.DataFrame({"close": self.close})
+        out = MACross(5, 17).generate_signals(df)
+        np.testing.assert_array_equal(out["position"].to_numpy(), self.expected[3])
+
+    def test_generate_signals_matches_step(self):
+        df = pd.DataFrame({"close": self.close})
+        out = MACross(5, 17).generate_signals(df)
+        strategy = MACross(5, 17)
+        steps = [strategy.step(c) for c in self.close]
+        self.assertEqual(out["position"].tolist(), steps)
+
+
+if __name__ == "__main__":
+    unittest.main()
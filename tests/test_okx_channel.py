@@ -0,0 +1,120 @@
+"""Tests for the OKX CandleChannel bounded queue."""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from client import okx
+
+
+def _entry(open_ms: int, close: str, confirm: bool) -> list[str]:
+    return [str(open_ms), "1", "2", "0.5", close, "10", "10", "10", "1" if confirm else "0"]
+
+
+class _FakeSocket:
+    """Transport stand-in: acks the subscribe, replays *frames*, then stops
+    the channel registered in *holder*.
+
+    The test consumes nothing until the replay is over, like a consumer
+    stalled behind a burst.
+    """
+
+    def __init__(self, frames: list[list[list[str]]], holder: dict) -> None:
+        self._frames = frames
+        self._holder = holder
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, msg: str) -> None:
+        pass
+
+    async def recv(self) -> str:
+        return json.dumps({"event": "subscribe"})
+
+    def __aiter__(self):
+        return self._replay()
+
+    async def _replay(self):
+        for data in self._frames:
+            yield json.dumps({"arg": {}, "data": data})
+        while "channel" not in self._holder:
+            await asyncio.sleep(0.001)
+        self._holder["channel"].close()
+
+
+class CandleChannelQueueTest(unittest.TestCase):
+    """A full queue sheds intra-bar updates but never a confirmed candle."""
+
+    def run_channel(self, frames, max_pending):
+        holder = {}
+
+        def connect(*args, **kwargs):
+            return _FakeSocket(frames, holder)
+
+        with mock.patch.object(okx.websockets, "connect", connect):
+            channel = okx.CandleChannel(
+                "wss://example", "ETH-USDT-SWAP", "1m", max_pending=max_pending,
+            )
+            holder["channel"] = channel
+            channel._thread.join(timeout=5)
+        self.assertFalse(channel._thread.is_alive())
+        return channel, [(c.timestamp, c.close, c.confirm) for c in channel]
+
+    def test_full_queue_drops_only_unconfirmed_updates(self):
+        bar0, bar1 = 1_735_689_600_000, 1_735_689_660_000
+        frames = [
+            [_entry(bar0, "1.0", False)],
+            [_entry(bar0, "1.1", False)],
+            # Queue is full from here on.
+            [_entry(bar0, "1.2", False)],
+            [_entry(bar0, "1.3", True), _entry(bar1, "2.0", False)],
+            [_entry(bar1, "2.1", False)],
+            [_entry(bar1, "2.2", True)],
+        ]
+        channel, got = self.run_channel(frames, max_pending=2)
+
+        self.assertEqual(got, [
+            ("2025-01-01 00:00:00", "1.0", False),
+            ("2025-01-01 00:00:00", "1.1", False),
+            ("2025-01-01 00:00:00", "1.3", True),
+            ("2025-01-01 00:01:00", "2.2", True),
+        ])
+        self.assertEqual(channel.dropped, 3)
+
+    def test_every_confirmed_candle_survives_a_stalled_consumer(self):
+        start = 1_735_689_600_000
+        frames = []
+        for i in range(50):
+            open_ms = start + i * 60_000
+            frames += [[_entry(open_ms, "1", False)]] * 3
+            frames.append([_entry(open_ms, str(i), True)])
+        channel, got = self.run_channel(frames, max_pending=4)
+
+        confirmed = [close for _, close, confirm in got if confirm]
+        self.assertEqual(confirmed, [str(i) for i in range(50)])
+        # Bar 0's three updates and its close fill the queue; every later
+        # intra-bar update is shed.
+        self.assertEqual(channel.dropped, 49 * 3)
+
+    def test_drop_warning_on_first_drop_and_each_interval(self):
+        channel, _ = self.run_channel([], max_pending=0)
+        unconfirmed = okx.Candle(
+            timestamp="t", open="1", high="1", low="1", close="1", volume="1",
+            volume_currency="1", volume_quote="1", confirm=False,
+        )
+        with mock.patch.object(okx.log, "warn") as warn:
+            for _ in range(okx._DROP_WARN_INTERVAL // 2):
+                channel._offer([unconfirmed, unconfirmed, unconfirmed])
+        counts = [call.args[1] for call in warn.call_args_list]
+        self.assertEqual(counts[0], 3)
+        self.assertEqual(len(counts), 2)
+        self.assertGreaterEqual(counts[1], okx._DROP_WARN_INTERVAL)
+
+
+if __name__ == "__main__":
+    unittest.main()
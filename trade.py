@@ -55,6 +55,7 @@ def run(client: okx.Client, executor: OkxExcutor) -> None:
 
 def main():
     client = setup.okx_client()
+    client.start_keep_alive()
     prices = preload(client)
     influx_client = _build_influx_client()
     if influx_client is not None:
@@ -75,6 +76,7 @@ def main():
         log.info("Stopping live trading...")
     finally:
         executor.close()
+        client.close()
 
 
 if __name__ == "__main__":